@@ -10,6 +10,14 @@ class Settings(BaseSettings):
     JWT_ALG: str = "HS256"
     JWT_EXPIRE_MIN: int = 60
 
+    # rate limits (requests per minute, per user or per IP)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN_PER_MIN: int = 10
+    RATE_LIMIT_SEARCH_PER_MIN: int = 60
+    RATE_LIMIT_UPLOAD_PER_MIN: int = 10
+    # comma-separated IPs/CIDRs of reverse proxies whose X-Forwarded-For is trusted
+    RATE_LIMIT_TRUSTED_PROXIES: str = ""
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 settings = Settings()
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Form, UploadFile, File
+from fastapi import APIRouter, Depends, Form, UploadFile, File
 from app.service.auth_service import AuthService
+from app.util.rate_limiter import rate_limit
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
@@ -13,6 +14,6 @@ async def register(
 ):
     return await AuthService.register(username, email, password, bio, profile_image)
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(rate_limit("login"))])
 async def login(email: str = Form(...), password: str = Form(...)):
     return await AuthService.login(email, password)
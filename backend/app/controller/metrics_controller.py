@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from app.util.auth_guard import get_current_user
+from app.util.rate_limiter import rejections
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+# counts are per process; with several workers each reports its own share
+@router.get("")
+async def metrics(me=Depends(get_current_user)):
+    return {"rate_limit_rejections": dict(rejections)}
@@ -10,6 +10,7 @@ from fastapi import Query
 # ✅ CHANGED imports (old: from db / deps)
 from app.config.database_config import get_db
 from app.util.auth_guard import get_current_user
+from app.util.rate_limiter import rate_limit
 
 router = APIRouter(prefix="/api/recipes", tags=["recipes"])
 
@@ -35,6 +36,7 @@ def _save_upload(up: UploadFile, folder: str, allowed_types: set[str]) -> str:
 
     return path, name
 
+# rate limited by upload_rate_limit middleware in main.py, before the body is read
 @router.post("")
 async def create_recipe(
     # ---- basic info ----
@@ -216,7 +218,7 @@ async def delete_recipe(recipe_id: str, me=Depends(get_current_user)):
     await col.delete_one({"_id": ObjectId(recipe_id)})
     return {"message": "Recipe deleted"}
 
-@router.get("")
+@router.get("", dependencies=[Depends(rate_limit("search", by_user=True))])
 async def list_recipes(
     q: Optional[str] = Query(None),
     cuisine: Optional[str] = Query(None),
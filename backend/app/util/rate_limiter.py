@@ -0,0 +1,190 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from ipaddress import ip_address, ip_network
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from app.config.config import settings
+from app.util.security import decode_token
+
+# route class -> requests per minute
+LIMITS = {
+    "login": settings.RATE_LIMIT_LOGIN_PER_MIN,
+    "search": settings.RATE_LIMIT_SEARCH_PER_MIN,
+    "upload": settings.RATE_LIMIT_UPLOAD_PER_MIN,
+}
+
+# route class -> number of rejected requests (per process, not shared across workers)
+rejections: dict[str, int] = defaultdict(int)
+
+TRUSTED_PROXIES = [
+    ip_network(p.strip(), strict=False)
+    for p in settings.RATE_LIMIT_TRUSTED_PROXIES.split(",")
+    if p.strip()
+]
+
+
+class RateLimitBackend(ABC):
+    """Stores token buckets. Subclass and pass to set_backend() to replace (e.g. Redis)."""
+
+    @abstractmethod
+    async def take(self, key: str, capacity: int, refill_per_sec: float) -> float:
+        """Consume one token. Returns 0 if allowed, else seconds until a token is available."""
+
+
+class InMemoryBackend(RateLimitBackend):
+    # hard cap on buckets; least recently used are evicted first
+    MAX_KEYS = 100_000
+    # full sweep of idle buckets runs at most this often (seconds)
+    PRUNE_INTERVAL = 60
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        # key -> (tokens, last refill timestamp, seconds until full again)
+        self.buckets: OrderedDict[str, tuple[float, float, float]] = OrderedDict()
+        self._last_prune = clock()
+
+    async def take(self, key: str, capacity: int, refill_per_sec: float) -> float:
+        now = self.clock()
+        self._maybe_prune(now)
+
+        tokens, last, _ = self.buckets.get(key, (float(capacity), now, 0.0))
+        tokens = min(capacity, tokens + (now - last) * refill_per_sec)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self.buckets[key] = (tokens, now, (capacity - tokens) / refill_per_sec)
+        self.buckets.move_to_end(key)
+        if len(self.buckets) > self.MAX_KEYS:
+            self.buckets.popitem(last=False)
+
+        return 0.0 if allowed else (1 - tokens) / refill_per_sec
+
+    def _maybe_prune(self, now: float):
+        if now - self._last_prune < self.PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        # a bucket that would be full again carries no state
+        for k in [k for k, (_, last, idle) in self.buckets.items() if now - last >= idle]:
+            del self.buckets[k]
+
+
+_backend: RateLimitBackend = InMemoryBackend()
+
+
+def set_backend(backend: RateLimitBackend):
+    global _backend
+    _backend = backend
+
+
+def _is_trusted(host: str) -> bool:
+    try:
+        addr = ip_address(host)
+    except ValueError:
+        return False
+    return any(addr in net for net in TRUSTED_PROXIES)
+
+
+def client_ip(request: Request) -> str:
+    """
+    Peer address, or the right-most untrusted X-Forwarded-For hop when the
+    peer is a proxy listed in RATE_LIMIT_TRUSTED_PROXIES.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted(peer):
+        return peer
+
+    hops = [h.strip() for h in request.headers.get("x-forwarded-for", "").split(",") if h.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+async def _check(route_class: str, key: str) -> int:
+    """Returns 0 if allowed, else the Retry-After delay in whole seconds."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return 0
+
+    per_min = LIMITS[route_class]
+    if per_min <= 0:
+        return 0
+
+    retry_after = await _backend.take(f"{route_class}:{key}", per_min, per_min / 60)
+    if retry_after > 0:
+        rejections[route_class] += 1
+        return math.ceil(retry_after)
+    return 0
+
+
+def _token_user(request: Request) -> str | None:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_token(token).get("sub")
+    except ValueError:
+        return None
+
+
+def _client_key(request: Request) -> str:
+    """Bearer token's sub (signature-checked, no DB lookup), else client IP."""
+    sub = _token_user(request)
+    return f"user:{sub}" if sub else f"ip:{client_ip(request)}"
+
+
+def _too_many(retry_after: int) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many requests",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def rate_limit(route_class: str, by_user: bool = False):
+    """
+    Dependency that limits a route class per client.
+    by_user=True keys on the bearer token's sub when one is sent, falling
+    back to client IP; otherwise always keys on client IP.
+    """
+    if route_class not in LIMITS:
+        raise ValueError(f"Unknown rate limit class: {route_class}")
+
+    if by_user:
+        async def dep(request: Request):
+            if retry_after := await _check(route_class, _client_key(request)):
+                raise _too_many(retry_after)
+    else:
+        async def dep(request: Request):
+            if retry_after := await _check(route_class, f"ip:{client_ip(request)}"):
+                raise _too_many(retry_after)
+
+    return dep
+
+
+def upload_rate_limit(route_class: str, method: str, path: str):
+    """
+    Middleware that limits one upload route before its body is read.
+    Route-level dependencies only run after FastAPI has parsed the whole
+    multipart body, so media uploads are checked here instead, keyed on the
+    bearer token's sub or client IP.
+    """
+    if route_class not in LIMITS:
+        raise ValueError(f"Unknown rate limit class: {route_class}")
+
+    async def middleware(request: Request, call_next):
+        if request.method == method and request.url.path.rstrip("/") == path:
+            if retry_after := await _check(route_class, _client_key(request)):
+                return JSONResponse(
+                    status_code=429,
+                    content={"detail": "Too many requests"},
+                    headers={"Retry-After": str(retry_after)},
+                )
+        return await call_next(request)
+
+    return middleware
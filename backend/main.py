@@ -3,13 +3,19 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config.database_config import connect_db, close_db
+from app.util.rate_limiter import upload_rate_limit
 
 from app.controller.auth_controller import router as auth_router
 from app.controller.recipes_controller import router as recipes_router
 from app.controller.cooking_controller import router as cooking_router
+from app.controller.metrics_controller import router as metrics_router
 
 app = FastAPI()
 
+# limit recipe uploads before FastAPI reads the multipart body
+# (registered before CORS so 429 responses still get CORS headers)
+app.middleware("http")(upload_rate_limit("upload", "POST", "/api/recipes"))
+
 # ✅ CORS (allow Next.js frontend)
 app.add_middleware(
     CORSMiddleware,
@@ -40,3 +46,4 @@ async def shutdown():
 app.include_router(auth_router)
 app.include_router(recipes_router)
 app.include_router(cooking_router)
+app.include_router(metrics_router)
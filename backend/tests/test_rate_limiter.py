@@ -0,0 +1,211 @@
+import asyncio
+from ipaddress import ip_network
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.util import rate_limiter
+from app.util.rate_limiter import InMemoryBackend, RateLimitBackend, rate_limit, upload_rate_limit
+from app.util.security import create_token
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def take(backend, key, capacity, refill_per_sec):
+    return asyncio.run(backend.take(key, capacity, refill_per_sec))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "_backend", InMemoryBackend(clock))
+    monkeypatch.setattr(rate_limiter, "rejections", rate_limiter.defaultdict(int))
+    monkeypatch.setattr(rate_limiter.settings, "RATE_LIMIT_ENABLED", True)
+    return clock
+
+
+# ---------------- InMemoryBackend ----------------
+
+def test_bucket_allows_capacity_then_reports_retry_delay():
+    b = InMemoryBackend(FakeClock())
+    assert take(b, "k", 2, 2 / 60) == 0
+    assert take(b, "k", 2, 2 / 60) == 0
+    assert take(b, "k", 2, 2 / 60) == pytest.approx(30)
+
+
+def test_bucket_refills_over_time():
+    clock = FakeClock()
+    b = InMemoryBackend(clock)
+    take(b, "k", 2, 2 / 60)
+    take(b, "k", 2, 2 / 60)
+
+    clock.now += 15  # half a token back
+    assert take(b, "k", 2, 2 / 60) == pytest.approx(15)
+
+    clock.now += 15
+    assert take(b, "k", 2, 2 / 60) == 0
+    assert take(b, "k", 2, 2 / 60) == pytest.approx(30)
+
+
+def test_bucket_refill_is_capped_at_capacity():
+    clock = FakeClock()
+    b = InMemoryBackend(clock)
+    take(b, "k", 2, 2 / 60)
+
+    clock.now += 3600
+    assert take(b, "k", 2, 2 / 60) == 0
+    assert take(b, "k", 2, 2 / 60) == 0
+    assert take(b, "k", 2, 2 / 60) > 0
+
+
+def test_keys_are_independent():
+    b = InMemoryBackend(FakeClock())
+    take(b, "a", 1, 1 / 60)
+    assert take(b, "a", 1, 1 / 60) > 0
+    assert take(b, "b", 1, 1 / 60) == 0
+
+
+def test_prune_drops_only_buckets_that_are_full_again():
+    clock = FakeClock()
+    b = InMemoryBackend(clock)
+    take(b, "fast", 10, 10 / 60)  # full again after 6s
+    take(b, "slow", 1, 1 / 600)   # full again after 600s
+
+    clock.now += b.PRUNE_INTERVAL
+    take(b, "other", 1, 1 / 60)
+
+    assert "fast" not in b.buckets
+    assert "slow" in b.buckets
+
+
+def test_prune_runs_at_most_once_per_interval():
+    clock = FakeClock()
+    b = InMemoryBackend(clock)
+    clock.now += b.PRUNE_INTERVAL
+    take(b, "a", 10, 10 / 60)
+
+    clock.now += b.PRUNE_INTERVAL - 1  # "a" is idle, but no sweep is due yet
+    take(b, "b", 10, 10 / 60)
+    assert "a" in b.buckets
+
+    clock.now += 1
+    take(b, "c", 10, 10 / 60)
+    assert "a" not in b.buckets
+
+
+def test_table_is_bounded_by_evicting_least_recently_used():
+    b = InMemoryBackend(FakeClock())
+    b.MAX_KEYS = 2
+    take(b, "a", 5, 5 / 60)
+    take(b, "b", 5, 5 / 60)
+    take(b, "a", 5, 5 / 60)
+    take(b, "c", 5, 5 / 60)
+
+    assert list(b.buckets) == ["a", "c"]
+
+
+def test_backend_must_implement_take():
+    class Incomplete(RateLimitBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+# ---------------- client_ip ----------------
+
+def _request(peer: str, forwarded: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+
+def test_client_ip_ignores_forwarded_header_from_untrusted_peer(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "TRUSTED_PROXIES", [ip_network("10.0.0.0/8")])
+    assert rate_limiter.client_ip(_request("1.2.3.4", "9.9.9.9")) == "1.2.3.4"
+
+
+def test_client_ip_uses_rightmost_untrusted_hop_behind_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "TRUSTED_PROXIES", [ip_network("10.0.0.0/8")])
+    req = _request("10.0.0.1", "6.6.6.6, 5.5.5.5, 10.0.0.2")
+    assert rate_limiter.client_ip(req) == "5.5.5.5"
+
+
+# ---------------- route level ----------------
+
+def _app():
+    app = FastAPI()
+
+    @app.post("/login", dependencies=[Depends(rate_limit("login"))])
+    async def login():
+        return {"ok": True}
+
+    @app.get("/search", dependencies=[Depends(rate_limit("search", by_user=True))])
+    async def search():
+        return {"ok": True}
+
+    app.middleware("http")(upload_rate_limit("upload", "POST", "/upload"))
+
+    @app.post("/upload")
+    async def upload():
+        return {"ok": True}
+
+    return app
+
+
+def test_route_returns_429_with_retry_after_and_counts_rejection(clock, monkeypatch):
+    monkeypatch.setitem(rate_limiter.LIMITS, "login", 2)
+    client = TestClient(_app())
+
+    assert client.post("/login").status_code == 200
+    assert client.post("/login").status_code == 200
+
+    r = client.post("/login")
+    assert r.status_code == 429
+    assert r.headers["Retry-After"] == "30"
+    assert rate_limiter.rejections["login"] == 1
+
+    clock.now += 30
+    assert client.post("/login").status_code == 200
+
+
+def test_search_keys_on_user_when_signed_in(clock, monkeypatch):
+    monkeypatch.setitem(rate_limiter.LIMITS, "search", 1)
+    client = TestClient(_app())
+    alice = {"Authorization": f"Bearer {create_token({'sub': 'alice'})}"}
+
+    assert client.get("/search").status_code == 200
+    assert client.get("/search").status_code == 429
+
+    # same IP, but a signed-in user gets their own bucket
+    assert client.get("/search", headers=alice).status_code == 200
+    assert client.get("/search", headers=alice).status_code == 429
+
+
+def test_search_with_invalid_token_falls_back_to_ip(clock, monkeypatch):
+    monkeypatch.setitem(rate_limiter.LIMITS, "search", 1)
+    client = TestClient(_app())
+
+    assert client.get("/search", headers={"Authorization": "Bearer junk"}).status_code == 200
+    assert client.get("/search").status_code == 429
+
+
+def test_upload_is_rejected_by_middleware_per_token_user(clock, monkeypatch):
+    monkeypatch.setitem(rate_limiter.LIMITS, "upload", 1)
+    client = TestClient(_app())
+    alice = {"Authorization": f"Bearer {create_token({'sub': 'alice'})}"}
+    bob = {"Authorization": f"Bearer {create_token({'sub': 'bob'})}"}
+
+    assert client.post("/upload", headers=alice).status_code == 200
+    r = client.post("/upload", headers=alice)
+    assert r.status_code == 429
+    assert r.headers["Retry-After"] == "60"
+    assert rate_limiter.rejections["upload"] == 1
+
+    assert client.post("/upload", headers=bob).status_code == 200